@@ -0,0 +1,93 @@
+import * as fs from 'fs';
+
+/**
+ * 默认写缓冲区大小（1 MB）
+ */
+const DEFAULT_BUFFER_SIZE = 1 << 20;
+
+/**
+ * UTF-16码元编码为UTF-8时的最大字节数
+ */
+const MAX_UTF8_BYTES_PER_CHAR = 3;
+
+/**
+ * 带缓冲的文本文件写入器，将文本直接编码到预分配的字节缓冲区，满后一次性写入磁盘
+ */
+export class BufferedWriter {
+    private readonly handle: fs.promises.FileHandle;
+    private readonly buffer: Buffer;
+    private offset = 0;
+
+    private constructor(handle: fs.promises.FileHandle, bufferSize: number) {
+        this.handle = handle;
+        this.buffer = Buffer.allocUnsafe(bufferSize);
+    }
+
+    /**
+     * 打开输出文件
+     * @param filePath 输出文件路径
+     * @param bufferSize 缓冲区大小，超过后写入磁盘
+     * @returns 写入器实例
+     */
+    public static async open(filePath: string, bufferSize: number = DEFAULT_BUFFER_SIZE): Promise<BufferedWriter> {
+        const handle = await fs.promises.open(filePath, 'w');
+        return new BufferedWriter(handle, bufferSize);
+    }
+
+    /**
+     * 写入文本，缓冲区剩余空间不足时自动刷新
+     * @param text 要写入的文本
+     */
+    public async write(text: string): Promise<void> {
+        // 按最坏情况估算编码长度，避免逐字符计算字节数
+        const maxBytes = text.length * MAX_UTF8_BYTES_PER_CHAR;
+        if (this.offset + maxBytes > this.buffer.length) {
+            await this.flush();
+            // 超过缓冲区容量的文本直接写入
+            if (maxBytes > this.buffer.length) {
+                const bytes = Buffer.from(text, 'utf8');
+                await this.writeFully(bytes, bytes.length);
+                return;
+            }
+        }
+        this.offset += this.buffer.write(text, this.offset, 'utf8');
+    }
+
+    /**
+     * 将缓冲区内容写入磁盘
+     */
+    public async flush(): Promise<void> {
+        if (this.offset > 0) {
+            const length = this.offset;
+            this.offset = 0;
+            await this.writeFully(this.buffer, length);
+        }
+    }
+
+    /**
+     * 写入字节直到全部完成，处理磁盘将满等情况下的部分写入
+     * @param data 要写入的字节
+     * @param length 写入的字节数
+     */
+    private async writeFully(data: Buffer, length: number): Promise<void> {
+        let offset = 0;
+        while (offset < length) {
+            const { bytesWritten } = await this.handle.write(data, offset, length - offset);
+            if (bytesWritten === 0) {
+                throw new Error('Failed to write output: no bytes written');
+            }
+            offset += bytesWritten;
+        }
+    }
+
+    /**
+     * 刷新缓冲区并关闭文件
+     */
+    public async close(): Promise<void> {
+        try {
+            await this.flush();
+        } finally {
+            await this.handle.close();
+        }
+    }
+}
@@ -4,6 +4,9 @@ import * as vscode from 'vscode';
 import { NpyParser } from './npyParser';
 import { XyzGenerator } from './xyzGenerator';
 
+// Matches dpdata set directory names such as set.000
+const SET_DIR_RE = /^set\.\d+$/;
+
 /**
  * Handles processing of dpdata directory structures
  */
@@ -19,7 +22,7 @@ export class DirectoryProcessor {
             const setDirs: string[] = [];
             
             for (const entry of dirEntries) {
-                if (entry.isDirectory() && entry.name.match(/^set\.\d+$/)) {
+                if (entry.isDirectory() && SET_DIR_RE.test(entry.name)) {
                     setDirs.push(path.join(baseDir, entry.name));
                 }
             }
@@ -188,43 +191,18 @@ export class DirectoryProcessor {
                 };
                 
                 // Generate XYZ or ExtXYZ
-                const outputPath = path.join(baseDir, `${setName}.${outputFormat === 'extxyz-full' ? 'extxyz' : outputFormat}`);
+                const outputPath = path.join(baseDir, `${setName}.${XyzGenerator.getOutputExtension(outputFormat)}`);
                 
-                if (outputFormat === 'xyz') {
-                    const xyzPath = await XyzGenerator.generateXyz(
-                        requiredFiles.atomTypes,
-                        requiredFiles.coordinates,
-                        requiredFiles.energies,
-                        outputPath
-                    );
-                    results[setName] = xyzPath;
-                } else if (outputFormat === 'extxyz') {
-                    // 标准ExtXYZ只包含基本属性
-                    const extxyzPath = await XyzGenerator.generateExtXyz(
-                        requiredFiles.atomTypes,
-                        requiredFiles.coordinates,
-                        requiredFiles.energies,
-                        optionalFiles.forces,
-                        optionalFiles.box,
-                        pbcOption,
-                        outputPath,
-                        false // 不包含所有属性
-                    );
-                    results[setName] = extxyzPath;
-                } else if (outputFormat === 'extxyz-full') {
-                    // 完整ExtXYZ包含所有发现的属性
-                    const extxyzPath = await XyzGenerator.generateExtXyz(
-                        requiredFiles.atomTypes,
-                        requiredFiles.coordinates,
-                        requiredFiles.energies,
-                        optionalFiles.forces,
-                        optionalFiles.box,
-                        pbcOption,
-                        outputPath,
-                        true // 包含所有属性
-                    );
-                    results[setName] = extxyzPath;
-                }
+                results[setName] = await XyzGenerator.generateByFormat(
+                    outputFormat,
+                    requiredFiles.atomTypes,
+                    requiredFiles.coordinates,
+                    requiredFiles.energies,
+                    optionalFiles.forces,
+                    optionalFiles.box,
+                    pbcOption,
+                    outputPath
+                );
             }
             
             return results;
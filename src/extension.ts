@@ -57,7 +57,7 @@ export function activate(context: vscode.ExtensionContext) {
             }
             
             // Create output file path in parent directory
-            const outputFilePath = path.join(parentDir, `${dirName}.${outputFormat === 'extxyz-full' ? 'extxyz' : outputFormat}`);
+            const outputFilePath = path.join(parentDir, `${dirName}.${XyzGenerator.getOutputExtension(outputFormat)}`);
             
             // Process files
             vscode.window.withProgress({
@@ -100,39 +100,17 @@ export function activate(context: vscode.ExtensionContext) {
                         box: txtFiles['box.npy'] || ''
                     };
                     
-                    let resultPath = '';
-                    
                     // Generate XYZ or ExtXYZ
-                    if (outputFormat === 'xyz') {
-                        resultPath = await XyzGenerator.generateXyz(
-                            requiredFiles.atomTypes,
-                            requiredFiles.coordinates,
-                            requiredFiles.energies,
-                            outputFilePath
-                        );
-                    } else if (outputFormat === 'extxyz') {
-                        resultPath = await XyzGenerator.generateExtXyz(
-                            requiredFiles.atomTypes,
-                            requiredFiles.coordinates,
-                            requiredFiles.energies,
-                            optionalFiles.forces,
-                            optionalFiles.box,
-                            pbcOption,
-                            outputFilePath,
-                            false // 不包含所有属性
-                        );
-                    } else if (outputFormat === 'extxyz-full') {
-                        resultPath = await XyzGenerator.generateExtXyz(
-                            requiredFiles.atomTypes,
-                            requiredFiles.coordinates,
-                            requiredFiles.energies,
-                            optionalFiles.forces,
-                            optionalFiles.box,
-                            pbcOption,
-                            outputFilePath,
-                            true // 包含所有属性
-                        );
-                    }
+                    const resultPath = await XyzGenerator.generateByFormat(
+                        outputFormat,
+                        requiredFiles.atomTypes,
+                        requiredFiles.coordinates,
+                        requiredFiles.energies,
+                        optionalFiles.forces,
+                        optionalFiles.box,
+                        pbcOption,
+                        outputFilePath
+                    );
                     
                     progress.report({ increment: 100, message: 'Completed!' });
                     
@@ -4,13 +4,41 @@ import * as path from 'path';
 import * as os from 'os';
 import * as util from 'util';
 import { exec } from 'child_process';
+import { BufferedWriter } from './bufferedWriter';
 
 const execPromise = util.promisify(exec);
 
+// Precompiled patterns for the NPY header dictionary
+const SHAPE_RE = /'shape':\s*\(([^)]*)\)/;
+const DTYPE_RE = /'descr':\s*'([^']*)'/;
+const FORTRAN_ORDER_RE = /'fortran_order':\s*(True|False)/;
+const SHAPE_SEPARATOR_RE = /\s*,\s*/;
+const DIGITS_RE = /^\d+$/;
+const DTYPE_SIZE_RE = /[<>|]?([a-zA-Z])(\d+)/;
+
+/**
+ * Numeric NPY data held in a contiguous typed array
+ */
+export type NumericArray = Float32Array | Float64Array | Int8Array | Int16Array | Int32Array |
+    Uint8Array | Uint16Array | Uint32Array;
+
+/**
+ * Parsed NPY data: a typed array for numeric dtypes, strings for 'S' dtypes
+ */
+export type NpyArray = NumericArray | string[];
+
+type NumericArrayConstructor = Float32ArrayConstructor | Float64ArrayConstructor | Int8ArrayConstructor |
+    Int16ArrayConstructor | Int32ArrayConstructor | Uint8ArrayConstructor | Uint16ArrayConstructor |
+    Uint32ArrayConstructor;
+
 /**
  * Custom implementation for parsing NPY files with fallback to Python
  */
 export class NpyParser {
+    // Memoised across conversions: a successful Python probe and the script write only run once per session
+    private static pythonAvailable?: Promise<boolean>;
+    private static pythonScriptPath?: Promise<string>;
+
     /**
      * Parse NumPy array header
      * @param buffer Buffer containing the NPY file data
@@ -43,9 +71,9 @@ export class NpyParser {
             const headerStr = buffer.toString('ascii', 10, headerLength).trim();
             
             // Parse shape, dtype, and fortran_order from header string
-            const shapeMatch = headerStr.match(/\'shape\':\s*\(([^\)]*)\)/);
-            const dtypeMatch = headerStr.match(/\'descr\':\s*\'([^\']*)\'/);
-            const fortranMatch = headerStr.match(/\'fortran_order\':\s*(True|False)/);
+            const shapeMatch = headerStr.match(SHAPE_RE);
+            const dtypeMatch = headerStr.match(DTYPE_RE);
+            const fortranMatch = headerStr.match(FORTRAN_ORDER_RE);
             
             if (!shapeMatch || !dtypeMatch || !fortranMatch) {
                 throw new Error('Invalid NPY header format');
@@ -58,12 +86,12 @@ export class NpyParser {
             
             if (shapeStr.length) {
                 // Check if it's a single-dimension array without trailing comma
-                if (!shapeStr.includes(',') && /^\d+$/.test(shapeStr)) {
+                if (!shapeStr.includes(',') && DIGITS_RE.test(shapeStr)) {
                     // Single number without comma - e.g. (10)
                     shape = [parseInt(shapeStr, 10)];
                 } else {
                     // Normal case with commas - e.g. (10, 20, 30) or (10,)
-                    shape = shapeStr.split(/\s*,\s*/)
+                    shape = shapeStr.split(SHAPE_SEPARATOR_RE)
                         .filter(s => s.trim().length > 0)  // Filter out empty strings
                         .map(s => parseInt(s.trim(), 10));
                 }
@@ -89,7 +117,7 @@ export class NpyParser {
      */
     private static getDtypeSize(dtype: string): number {
         // Extract the size from dtype string (e.g., '<f8' -> 8, '|S10' -> 10)
-        const match = dtype.match(/[<>|]?([a-zA-Z])(\d+)/);
+        const match = dtype.match(DTYPE_SIZE_RE);
         if (!match) return 4; // Default to 4 bytes
         
         // Handle special cases
@@ -102,18 +130,39 @@ export class NpyParser {
         return parseInt(match[2], 10);
     }
 
+    /**
+     * Get the typed array constructor matching a NumPy data type
+     * @param typecode NumPy type character ('f', 'i', 'u', 'b', ...)
+     * @param dtypeSize Size in bytes of one element
+     * @returns Typed array constructor, or undefined if no native equivalent exists
+     */
+    private static getTypedArrayConstructor(typecode: string, dtypeSize: number): NumericArrayConstructor | undefined {
+        switch (typecode) {
+            case 'f':
+                return dtypeSize === 4 ? Float32Array : dtypeSize === 8 ? Float64Array : undefined;
+            case 'i':
+                return dtypeSize === 1 ? Int8Array : dtypeSize === 2 ? Int16Array : dtypeSize === 4 ? Int32Array : undefined;
+            case 'u':
+                return dtypeSize === 1 ? Uint8Array : dtypeSize === 2 ? Uint16Array : dtypeSize === 4 ? Uint32Array : undefined;
+            case 'b':
+                return dtypeSize === 1 ? Uint8Array : undefined;
+            default:
+                return undefined;
+        }
+    }
+
     /**
      * Parse NumPy data based on data type
      * @param buffer Buffer containing the data
      * @param offset Start offset in the buffer
      * @param dtype NumPy data type
      * @param size Number of elements to read
-     * @returns Array of parsed values
+     * @returns Typed array of numeric values, or array of strings for string data
      */
-    private static parseData(buffer: Buffer, offset: number, dtype: string, size: number): (number | string)[] {
-        const result: (number | string)[] = [];
+    private static parseData(buffer: Buffer, offset: number, dtype: string, size: number): NpyArray {
         const dtypeSize = this.getDtypeSize(dtype);
-        const typecode = dtype.charAt(dtype.length - 1);
+        const dtypeMatch = dtype.match(DTYPE_SIZE_RE);
+        const typecode = dtypeMatch ? dtypeMatch[1] : 'f';
         
         // Check endianness
         const littleEndian = dtype.charAt(0) === '<' || (dtype.charAt(0) !== '>' && 
@@ -124,7 +173,28 @@ export class NpyParser {
         if (actualSize < size) {
             console.warn(`Buffer too small for expected data size. Expected ${size} elements, but can only read ${actualSize}.`);
         }
-                           
+        
+        if (typecode === 'S') {
+            // string (ASCII), null-padded to a fixed width
+            const strings: string[] = [];
+            for (let i = 0; i < actualSize; i++) {
+                const pos = offset + i * dtypeSize;
+                let end = pos;
+                while (end < pos + dtypeSize && buffer[end] !== 0) end++;
+                strings.push(buffer.toString('latin1', pos, end));
+            }
+            return strings;
+        }
+        
+        // Native byte order and aligned data can be viewed in place without copying
+        const TypedArray = this.getTypedArrayConstructor(typecode, dtypeSize);
+        const byteOffset = buffer.byteOffset + offset;
+        if (TypedArray && littleEndian === (os.endianness() === 'LE') && byteOffset % dtypeSize === 0) {
+            return new TypedArray(buffer.buffer, byteOffset, actualSize);
+        }
+        
+        // Otherwise copy element by element; 64-bit integers are converted to Number
+        const result = TypedArray ? new TypedArray(actualSize) : new Float64Array(actualSize);
         for (let i = 0; i < actualSize; i++) {
             const pos = offset + i * dtypeSize;
             
@@ -132,50 +202,41 @@ export class NpyParser {
             switch (typecode) {
                 case 'f': // float
                     if (dtypeSize === 4) {
-                        result.push(littleEndian ? buffer.readFloatLE(pos) : buffer.readFloatBE(pos));
+                        result[i] = littleEndian ? buffer.readFloatLE(pos) : buffer.readFloatBE(pos);
                     } else if (dtypeSize === 8) {
-                        result.push(littleEndian ? buffer.readDoubleLE(pos) : buffer.readDoubleBE(pos));
+                        result[i] = littleEndian ? buffer.readDoubleLE(pos) : buffer.readDoubleBE(pos);
                     }
                     break;
                 case 'i': // integer
                     if (dtypeSize === 1) {
-                        result.push(buffer.readInt8(pos));
+                        result[i] = buffer.readInt8(pos);
                     } else if (dtypeSize === 2) {
-                        result.push(littleEndian ? buffer.readInt16LE(pos) : buffer.readInt16BE(pos));
+                        result[i] = littleEndian ? buffer.readInt16LE(pos) : buffer.readInt16BE(pos);
                     } else if (dtypeSize === 4) {
-                        result.push(littleEndian ? buffer.readInt32LE(pos) : buffer.readInt32BE(pos));
+                        result[i] = littleEndian ? buffer.readInt32LE(pos) : buffer.readInt32BE(pos);
                     } else if (dtypeSize === 8) {
                         const val = littleEndian ? buffer.readBigInt64LE(pos) : buffer.readBigInt64BE(pos);
-                        result.push(Number(val)); // Convert BigInt to Number
+                        result[i] = Number(val); // Convert BigInt to Number
                     }
                     break;
                 case 'u': // unsigned integer
                     if (dtypeSize === 1) {
-                        result.push(buffer.readUInt8(pos));
+                        result[i] = buffer.readUInt8(pos);
                     } else if (dtypeSize === 2) {
-                        result.push(littleEndian ? buffer.readUInt16LE(pos) : buffer.readUInt16BE(pos));
+                        result[i] = littleEndian ? buffer.readUInt16LE(pos) : buffer.readUInt16BE(pos);
                     } else if (dtypeSize === 4) {
-                        result.push(littleEndian ? buffer.readUInt32LE(pos) : buffer.readUInt32BE(pos));
+                        result[i] = littleEndian ? buffer.readUInt32LE(pos) : buffer.readUInt32BE(pos);
                     } else if (dtypeSize === 8) {
                         const val = littleEndian ? buffer.readBigUInt64LE(pos) : buffer.readBigUInt64BE(pos);
-                        result.push(Number(val)); // Convert BigInt to Number
+                        result[i] = Number(val); // Convert BigInt to Number
                     }
                     break;
                 case 'b': // boolean
-                    result.push(buffer.readUInt8(pos) !== 0 ? 1 : 0); // Convert boolean to number
-                    break;
-                case 'S': // string (ASCII)
-                    let str = '';
-                    for (let j = 0; j < dtypeSize; j++) {
-                        const charCode = buffer.readUInt8(pos + j);
-                        if (charCode === 0) break; // Null terminator
-                        str += String.fromCharCode(charCode);
-                    }
-                    result.push(str);
+                    result[i] = buffer.readUInt8(pos) !== 0 ? 1 : 0; // Convert boolean to number
                     break;
                 default:
                     // Default to float
-                    result.push(littleEndian ? buffer.readFloatLE(pos) : buffer.readFloatBE(pos));
+                    result[i] = littleEndian ? buffer.readFloatLE(pos) : buffer.readFloatBE(pos);
             }
         }
         
@@ -187,7 +248,7 @@ export class NpyParser {
      * @param buffer Buffer containing the NPY file data
      * @returns Object with parsed data and metadata
      */
-    public static parseNpy(buffer: Buffer): { data: (number | string)[]; shape: number[]; dtype: string } {
+    public static parseNpy(buffer: Buffer): { data: NpyArray; shape: number[]; dtype: string } {
         try {
             // Parse header
             const { dtype, shape, fortranOrder, headerLength } = this.parseNpyHeader(buffer);
@@ -206,16 +267,18 @@ export class NpyParser {
     }
 
     /**
-     * Check if Python with NumPy is available
+     * Check if Python with NumPy is available, reusing a successful probe
      * @returns Promise<boolean> True if Python with NumPy is available
      */
-    private static async isPythonWithNumpyAvailable(): Promise<boolean> {
-        try {
-            await execPromise('python -c "import numpy"');
-            return true;
-        } catch (error) {
-            return false;
+    private static isPythonWithNumpyAvailable(): Promise<boolean> {
+        if (!this.pythonAvailable) {
+            this.pythonAvailable = execPromise('python -c "import numpy"').then(() => true, () => {
+                // Probe again next time, NumPy may be installed without reloading the extension
+                this.pythonAvailable = undefined;
+                return false;
+            });
         }
+        return this.pythonAvailable;
     }
 
     /**
@@ -225,72 +288,175 @@ export class NpyParser {
     private static async createPythonScript(scriptPath: string): Promise<void> {
         const pythonScript = `
 import sys
+import json
 import numpy as np
 
-def convert_npy_to_text(npy_path, output_path=None):
+WRITE_BUFFER_SIZE = 1 << 20
+
+def read_type_map(type_map_path):
+    with open(type_map_path) as f:
+        return [line.strip() for line in f if line.strip()]
+
+def convert_npy_to_text(npy_path, output_path=None, type_map=None):
     try:
-        # Load the NPY file
-        data = np.load(npy_path)
+        # Memory-map the NPY file so rows are paged in as savetxt streams them
+        data = np.load(npy_path, mmap_mode='r')
         
-        # Determine output format based on shape
-        if len(data.shape) == 1:
-            # 1D array - each item on a separate line
-            np.savetxt(output_path or sys.stdout, data, fmt='%s')
-        elif len(data.shape) == 2:
-            # 2D array - space-separated values, rows separated by newlines
-            np.savetxt(output_path or sys.stdout, data, fmt='%s')
-        else:
-            # For higher dimensions, flatten and output space-separated
-            flat_data = data.flatten()
-            if output_path:
-                with open(output_path, 'w') as f:
-                    f.write(' '.join(map(str, flat_data)))
+        # Map type indices to element symbols in a single gather
+        if type_map is not None:
+            data = np.asarray(type_map)[data.astype(np.intp)]
+        
+        # Write through a large buffer so savetxt's per-row writes are batched
+        out = open(output_path, 'w', buffering=WRITE_BUFFER_SIZE) if output_path else sys.stdout
+        try:
+            # Determine output format based on shape
+            if 1 <= data.ndim <= 2:
+                # 1D array - each item on a separate line
+                # 2D array - space-separated values, rows separated by newlines
+                np.savetxt(out, data, fmt='%s')
             else:
-                print(' '.join(map(str, flat_data)))
+                # For scalars and higher dimensions, flatten and output space-separated
+                out.write(' '.join(map(str, data.flatten())))
+                if out is sys.stdout:
+                    out.write('\\n')
+        finally:
+            if out is not sys.stdout:
+                out.close()
     except Exception as e:
-        sys.stderr.write(f"Error: {str(e)}\\n")
+        sys.stderr.write(f"Error converting {npy_path}: {str(e)}\\n")
         sys.exit(1)
 
+def convert_batch(manifest_path):
+    # Convert every file listed in the manifest within this single process
+    with open(manifest_path) as f:
+        tasks = json.load(f)
+    
+    # Read each type map once even if several files share it
+    type_maps = {}
+    for task in tasks:
+        if task.get('type_map') and task['type_map'] not in type_maps:
+            type_maps[task['type_map']] = read_type_map(task['type_map'])
+    
+    # savetxt formats rows in Python while holding the GIL, so convert files one after another
+    for task in tasks:
+        convert_npy_to_text(task['npy'], task['output'], type_maps.get(task.get('type_map')))
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        sys.stderr.write("Usage: python script.py input.npy [output.txt]\\n")
+        sys.stderr.write("Usage: python script.py input.npy [output.txt] [type_map.raw]\\n")
+        sys.stderr.write("       python script.py --batch manifest.json\\n")
         sys.exit(1)
     
+    if sys.argv[1] == '--batch':
+        convert_batch(sys.argv[2])
+        sys.exit(0)
+    
     npy_path = sys.argv[1]
     output_path = sys.argv[2] if len(sys.argv) > 2 else None
+    type_map = read_type_map(sys.argv[3]) if len(sys.argv) > 3 else None
     
-    convert_npy_to_text(npy_path, output_path)
+    convert_npy_to_text(npy_path, output_path, type_map)
 `;
         await fs.promises.writeFile(scriptPath, pythonScript);
     }
 
     /**
-     * Parse NPY file using Python fallback
-     * @param npyFilePath Path to the NPY file
-     * @param outputPath Path where to save the output text
-     * @returns Promise<void>
+     * Write the Python conversion script to the temporary directory, reusing it if already written
+     * @returns Path to the written script
      */
-    private static async parseNpyWithPython(npyFilePath: string, outputPath: string): Promise<void> {
+    private static async preparePythonScript(): Promise<string> {
+        if (this.pythonScriptPath) {
+            try {
+                const scriptPath = await this.pythonScriptPath;
+                // The temporary directory may have been cleaned since the script was written
+                await fs.promises.access(scriptPath);
+                return scriptPath;
+            } catch {
+                this.pythonScriptPath = undefined;
+            }
+        }
+        
+        this.pythonScriptPath = this.writePythonScript();
+        return this.pythonScriptPath;
+    }
+
+    /**
+     * Write a fresh copy of the Python conversion script
+     * @returns Path to the written script
+     */
+    private static async writePythonScript(): Promise<string> {
         const tempDir = path.join(os.tmpdir(), 'dpdata-xyz');
         await fs.promises.mkdir(tempDir, { recursive: true });
         
         const scriptPath = path.join(tempDir, 'convert_npy.py');
         await this.createPythonScript(scriptPath);
+        return scriptPath;
+    }
+
+    /**
+     * Parse NPY file using Python fallback
+     * @param npyFilePath Path to the NPY file
+     * @param outputPath Path where to save the output text
+     * @param typeMapPath Optional type_map.raw used to map type indices to element symbols
+     * @param scriptPath Previously prepared conversion script, written on demand if omitted
+     * @returns Promise<void>
+     */
+    private static async parseNpyWithPython(
+        npyFilePath: string,
+        outputPath: string,
+        typeMapPath?: string,
+        scriptPath?: string
+    ): Promise<void> {
+        scriptPath = scriptPath || await this.preparePythonScript();
         
         try {
-            await execPromise(`python "${scriptPath}" "${npyFilePath}" "${outputPath}"`);
+            const typeMapArg = typeMapPath ? ` "${typeMapPath}"` : '';
+            await execPromise(`python "${scriptPath}" "${npyFilePath}" "${outputPath}"${typeMapArg}`);
         } catch (error) {
             console.error('Error executing Python script:', error);
             throw new Error(`Failed to convert NPY file with Python: ${error}`);
         }
     }
 
+    /**
+     * Parse several NPY files in a single Python process
+     * @param tasks Files to convert with their output paths and optional type_map.raw
+     * @param scriptPath Prepared conversion script
+     * @returns Promise<void>
+     */
+    private static async parseNpyBatchWithPython(
+        tasks: { npyFilePath: string; outputPath: string; typeMapPath?: string }[],
+        scriptPath: string
+    ): Promise<void> {
+        const manifestPath = path.join(path.dirname(scriptPath), `batch_${process.pid}_${Date.now()}.json`);
+        const manifest = tasks.map(task => ({
+            npy: task.npyFilePath,
+            output: task.outputPath,
+            type_map: task.typeMapPath || null
+        }));
+        await fs.promises.writeFile(manifestPath, JSON.stringify(manifest));
+        
+        try {
+            await execPromise(`python "${scriptPath}" --batch "${manifestPath}"`);
+        } catch (error) {
+            console.error('Error executing Python script:', error);
+            throw new Error(`Failed to convert NPY files with Python: ${error}`);
+        } finally {
+            try {
+                await fs.promises.unlink(manifestPath);
+            } catch (err) {
+                console.warn('Failed to delete batch manifest:', err);
+            }
+        }
+    }
+
     /**
      * Reads a .npy file and returns its data as a string
      * @param filePath Path to the .npy file
+     * @param typeMap Optional element symbols used to map type indices
      * @returns Promise resolving to the data as a string
      */
-    public static async parseNpyToString(filePath: string): Promise<string> {
+    public static async parseNpyToString(filePath: string, typeMap?: string[]): Promise<string> {
         // First try using JavaScript implementation
         try {
             // Read the binary data from the .npy file
@@ -299,6 +465,11 @@ if __name__ == "__main__":
             // Parse the NPY data
             const npyData = this.parseNpy(buffer);
             
+            // Map type indices to element symbols
+            if (typeMap) {
+                npyData.data = Array.from(npyData.data as ArrayLike<number | string>, i => typeMap[Number(i)]);
+            }
+            
             // Convert to a string based on shape
             if (npyData.shape.length === 1) {
                 // 1D array - each item on a separate line
@@ -308,11 +479,7 @@ if __name__ == "__main__":
                 const rows = [];
                 const [numRows, numCols] = npyData.shape;
                 for (let i = 0; i < numRows; i++) {
-                    const rowItems = [];
-                    for (let j = 0; j < numCols; j++) {
-                        rowItems.push(npyData.data[i * numCols + j]);
-                    }
-                    rows.push(rowItems.join(' '));
+                    rows.push(npyData.data.slice(i * numCols, (i + 1) * numCols).join(' '));
                 }
                 return rows.join('\n');
             } else {
@@ -324,21 +491,30 @@ if __name__ == "__main__":
             
             // Check if Python with NumPy is available
             if (await this.isPythonWithNumpyAvailable()) {
-                // Use Python fallback
-                const tempOutputPath = path.join(os.tmpdir(), `temp_${Date.now()}.txt`);
-                await this.parseNpyWithPython(filePath, tempOutputPath);
+                // Use Python fallback, writing into a private temporary directory
+                const tempDir = await fs.promises.mkdtemp(path.join(os.tmpdir(), 'dpdata-xyz-'));
                 
-                // Read the output file
-                const result = await fs.promises.readFile(tempOutputPath, 'utf-8');
-                
-                // Clean up
                 try {
-                    await fs.promises.unlink(tempOutputPath);
-                } catch (err) {
-                    console.warn('Failed to delete temporary file:', err);
+                    const tempOutputPath = path.join(tempDir, 'output.txt');
+                    
+                    // The script reads the type map from disk, so hand it over as a RAW file
+                    let typeMapPath: string | undefined;
+                    if (typeMap) {
+                        typeMapPath = path.join(tempDir, 'type_map.raw');
+                        await fs.promises.writeFile(typeMapPath, typeMap.join('\n'));
+                    }
+                    await this.parseNpyWithPython(filePath, tempOutputPath, typeMapPath);
+                    
+                    // Read the output file
+                    return await fs.promises.readFile(tempOutputPath, 'utf-8');
+                } finally {
+                    // Clean up even if the conversion failed
+                    try {
+                        await fs.promises.rm(tempDir, { recursive: true, force: true });
+                    } catch (err) {
+                        console.warn('Failed to delete temporary directory:', err);
+                    }
                 }
-                
-                return result;
             } else {
                 throw new Error(`Failed to parse NPY file: ${error}. Python with NumPy not available as fallback.`);
             }
@@ -349,23 +525,50 @@ if __name__ == "__main__":
      * Converts a .npy file to a .txt file
      * @param npyFilePath Path to the input .npy file
      * @param outputDir Directory where the output .txt file will be saved
+     * @param typeMapPath Optional type_map.raw used to map type indices to element symbols
      * @returns Path to the created .txt file
      */
-    public static async convertNpyToTxt(npyFilePath: string, outputDir?: string): Promise<string> {
+    public static async convertNpyToTxt(npyFilePath: string, outputDir?: string, typeMapPath?: string): Promise<string> {
+        // Check if Python with NumPy is available first
+        const scriptPath = await this.isPythonWithNumpyAvailable() ? await this.preparePythonScript() : undefined;
+        return this.convertNpyFile(npyFilePath, outputDir, typeMapPath, scriptPath);
+    }
+
+    /**
+     * Builds the path of the .txt file produced for a .npy file
+     * @param npyFilePath Path to the input .npy file
+     * @param dirPath Directory where the output .txt file will be saved
+     * @returns Path to the .txt file
+     */
+    private static getTxtOutputPath(npyFilePath: string, dirPath: string): string {
+        return path.join(dirPath, `${path.basename(npyFilePath, '.npy')}.txt`);
+    }
+
+    /**
+     * Converts a .npy file to a .txt file with an already resolved converter
+     * @param npyFilePath Path to the input .npy file
+     * @param outputDir Directory where the output .txt file will be saved
+     * @param typeMapPath Optional type_map.raw used to map type indices to element symbols
+     * @param scriptPath Prepared Python script, or undefined to use the JavaScript implementation
+     * @returns Path to the created .txt file
+     */
+    private static async convertNpyFile(
+        npyFilePath: string,
+        outputDir?: string,
+        typeMapPath?: string,
+        scriptPath?: string
+    ): Promise<string> {
         try {
-            const fileName = path.basename(npyFilePath, '.npy');
             const dirPath = outputDir || path.dirname(npyFilePath);
-            const outputPath = path.join(dirPath, `${fileName}.txt`);
-            
-            // Check if Python with NumPy is available first
-            const pythonAvailable = await this.isPythonWithNumpyAvailable();
+            const outputPath = this.getTxtOutputPath(npyFilePath, dirPath);
             
-            if (pythonAvailable) {
+            if (scriptPath) {
                 // Use Python directly for better reliability
-                await this.parseNpyWithPython(npyFilePath, outputPath);
+                await this.parseNpyWithPython(npyFilePath, outputPath, typeMapPath, scriptPath);
             } else {
                 // Fallback to JavaScript implementation
-                const dataString = await this.parseNpyToString(npyFilePath);
+                const typeMap = typeMapPath ? await this.readRawFile(typeMapPath) : undefined;
+                const dataString = await this.parseNpyToString(npyFilePath, typeMap);
                 
                 // Write to text file
                 await fs.promises.mkdir(dirPath, { recursive: true });
@@ -387,13 +590,54 @@ if __name__ == "__main__":
     public static async readRawFile(filePath: string): Promise<string[]> {
         try {
             const content = await fs.promises.readFile(filePath, 'utf-8');
-            return content.trim().split('\n').map(line => line.trim());
+            const rawLines = content.trim().split(/\r?\n/);
+            const lines: string[] = [];
+            for (const rawLine of rawLines) {
+                const line = rawLine.trim();
+                if (line) {
+                    lines.push(line);
+                }
+            }
+            
+            // Blank lines would shift type indices, so drop them with a single warning
+            const skipped = rawLines.length - lines.length;
+            if (skipped > 0 && content.trim()) {
+                console.warn(`Skipped ${skipped} empty line(s) in ${filePath}`);
+            }
+            
+            return lines;
         } catch (error) {
             console.error('Error reading RAW file:', error);
             throw new Error(`Failed to read RAW file: ${error}`);
         }
     }
 
+    /**
+     * Counts the non-empty lines of a text file by scanning its bytes
+     * @param filePath Path to the text file
+     * @returns Number of lines containing non-whitespace characters
+     */
+    private static async countNonEmptyLines(filePath: string): Promise<number> {
+        const buffer = await fs.promises.readFile(filePath);
+        let count = 0;
+        let pos = 0;
+        while (pos < buffer.length) {
+            let eol = buffer.indexOf(0x0a, pos);
+            if (eol === -1) {
+                eol = buffer.length;
+            }
+            for (let k = pos; k < eol; k++) {
+                const byte = buffer[k];
+                if (byte !== 0x20 && (byte < 0x09 || byte > 0x0d)) {
+                    count++;
+                    break;
+                }
+            }
+            pos = eol + 1;
+        }
+        return count;
+    }
+
     /**
      * Process a set of NPY files in a directory along with type_map.raw and type.raw
      * @param npyFiles Array of NPY file paths
@@ -427,27 +671,53 @@ if __name__ == "__main__":
             typeData = typeLines.map(line => parseInt(line, 10));
         }
 
+        // Resolve the converter once for the whole batch
+        const scriptPath = await this.isPythonWithNumpyAvailable() ? await this.preparePythonScript() : undefined;
+
         // Process NPY files
-        for (const npyFile of npyFiles) {
+        const tasks = npyFiles.map(npyFile => {
             const fileName = path.basename(npyFile);
-            const outputPath = await this.convertNpyToTxt(npyFile, dirPath);
-            results[fileName] = outputPath;
+            return {
+                fileName,
+                npyFilePath: npyFile,
+                outputPath: this.getTxtOutputPath(npyFile, dirPath),
+                // real_atom_types.npy stores type indices, map them through type_map.raw
+                typeMapPath: fileName === 'real_atom_types.npy' && typeMapPath ? typeMapPath : undefined
+            };
+        });
+        
+        if (scriptPath) {
+            // Convert all files in a single Python process
+            await this.parseNpyBatchWithPython(tasks, scriptPath);
+        } else {
+            for (const task of tasks) {
+                await this.convertNpyFile(task.npyFilePath, dirPath, task.typeMapPath);
+            }
+        }
+        
+        for (const task of tasks) {
+            results[task.fileName] = task.outputPath;
         }
 
         // Special processing for real_atom_types if needed
         const energyTxtPath = results['energy.npy'];
         if (typeMap.length > 0 && typeData.length > 0 && energyTxtPath && !results['real_atom_types.npy']) {
-            const energyContent = await fs.promises.readFile(energyTxtPath, 'utf-8');
-            const numFrames = energyContent.trim().split('\n').length;
+            const numFrames = await this.countNonEmptyLines(energyTxtPath);
             
             // Create real_atom_types
             const atomTypes = typeData.map(i => typeMap[i]);
-            const atomTypesStr = atomTypes.join(' ');
+            const atomTypesRow = atomTypes.join(' ') + '\n';
             const realAtomTypesPath = path.join(dirPath, 'real_atom_types.txt');
             
-            // Repeat for each frame
-            const content = Array(numFrames).fill(atomTypesStr).join('\n');
-            await fs.promises.writeFile(realAtomTypesPath, content);
+            // Repeat the row for each frame without building the whole file in memory
+            const out = await BufferedWriter.open(realAtomTypesPath);
+            try {
+                for (let i = 0; i < numFrames; i++) {
+                    await out.write(atomTypesRow);
+                }
+            } finally {
+                await out.close();
+            }
             
             results['real_atom_types'] = realAtomTypesPath;
         }
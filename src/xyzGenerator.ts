@@ -1,13 +1,30 @@
 import * as fs from 'fs';
 import * as path from 'path';
 import * as vscode from 'vscode';
+import { BufferedWriter } from './bufferedWriter';
+
+// 预编译的空白分隔符模式
+const WHITESPACE_RE = /\s+/;
+
+// 换行符的字节值
+const NEWLINE_BYTE = 0x0a;
+
+// NumPy写出的非有限值（小写形式），Number()无法识别inf和nan
+const NON_FINITE_VALUES = new Map<string, number>([
+    ['inf', Infinity], ['+inf', Infinity], ['-inf', -Infinity],
+    ['infinity', Infinity], ['+infinity', Infinity], ['-infinity', -Infinity],
+    ['nan', NaN], ['+nan', NaN], ['-nan', NaN]
+]);
+
+// 文本中没有小数点、指数或inf/nan的行（整数类型数据），输出时保持整数写法
+const INTEGER_TEXT_LINES = new WeakSet<Float64Array>();
 
 /**
  * 处理XYZ和ExtXYZ文件生成
  */
 export class XyzGenerator {
     /**
-     * 读取文件内容并返回数据数组
+     * 读取文件内容并返回数据数组，内容相同的连续行共享同一个数组
      * @param filePath 文本文件路径
      * @returns 处理后的数据数组
      */
@@ -17,11 +34,17 @@ export class XyzGenerator {
             const lines = content.trim().split('\n');
             
             const data: string[][] = [];
+            let previousLine = '';
+            let previousItems: string[] = [];
             for (const line of lines) {
                 const trimmedLine = line.trim();
                 if (trimmedLine) {
-                    const items = trimmedLine.split(/\s+/);
-                    data.push(items);
+                    // 与上一行相同时直接复用（如每帧重复的原子类型）
+                    if (trimmedLine !== previousLine) {
+                        previousItems = trimmedLine.split(WHITESPACE_RE);
+                        previousLine = trimmedLine;
+                    }
+                    data.push(previousItems);
                 }
             }
             
@@ -31,6 +54,166 @@ export class XyzGenerator {
         }
     }
 
+    /**
+     * 读取数值文本文件，每行解析为一个连续的Float64Array
+     * @param filePath 文本文件路径
+     * @returns 每帧一个数值数组
+     */
+    public static async readNumericFile(filePath: string): Promise<Float64Array[]> {
+        try {
+            const buffer = await fs.promises.readFile(filePath);
+            
+            const data: Float64Array[] = [];
+            let pos = 0;
+            while (pos < buffer.length) {
+                // 直接在字节上查找行边界，不生成整个文件的字符串
+                let eol = buffer.indexOf(NEWLINE_BYTE, pos);
+                if (eol === -1) {
+                    eol = buffer.length;
+                }
+                
+                const values = this.parseNumericLine(buffer, pos, eol);
+                if (values.length > 0) {
+                    data.push(values);
+                }
+                pos = eol + 1;
+            }
+            
+            return data;
+        } catch (error) {
+            throw new Error(`Failed to read numeric file ${filePath}: ${error}`);
+        }
+    }
+
+    /**
+     * 解析缓冲区中一行以空白分隔的数值
+     * @param buffer 文件内容
+     * @param start 行起始位置
+     * @param end 行结束位置（不含）
+     * @returns 该行的数值数组，整数写法的行会记录在INTEGER_TEXT_LINES中
+     */
+    private static parseNumericLine(buffer: Buffer, start: number, end: number): Float64Array {
+        // 第一遍统计数值个数，以便一次分配数组，同时检查是否出现小数点或字母
+        let count = 0;
+        let floatSyntax = false;
+        let k = start;
+        while (k < end) {
+            while (k < end && this.isWhitespaceByte(buffer[k])) k++;
+            if (k >= end) break;
+            count++;
+            for (; k < end && !this.isWhitespaceByte(buffer[k]); k++) {
+                if (buffer[k] === 0x2e || buffer[k] >= 0x41) {
+                    floatSyntax = true;
+                }
+            }
+        }
+        
+        // 第二遍解析每个数值
+        const values = new Float64Array(count);
+        let index = 0;
+        k = start;
+        while (index < count) {
+            while (this.isWhitespaceByte(buffer[k])) k++;
+            const tokenStart = k;
+            while (k < end && !this.isWhitespaceByte(buffer[k])) k++;
+            values[index++] = this.parseNumber(buffer, tokenStart, k);
+        }
+        
+        if (count > 0 && !floatSyntax) {
+            INTEGER_TEXT_LINES.add(values);
+        }
+        return values;
+    }
+
+    /**
+     * 解析缓冲区中的一个数值，Number()无法识别时再按inf、nan（不区分大小写）识别
+     * @param buffer 文件内容
+     * @param start 数值起始位置
+     * @param end 数值结束位置（不含）
+     * @returns 解析后的数值
+     */
+    private static parseNumber(buffer: Buffer, start: number, end: number): number {
+        const token = buffer.toString('latin1', start, end);
+        const value = Number(token);
+        if (!Number.isNaN(value)) {
+            return value;
+        }
+        const nonFinite = NON_FINITE_VALUES.get(token.toLowerCase());
+        return nonFinite !== undefined ? nonFinite : NaN;
+    }
+
+    /**
+     * 判断字节是否为空白字符（空格、制表符、回车等）
+     * @param byte 字节值
+     * @returns 是否为空白字符
+     */
+    private static isWhitespaceByte(byte: number): boolean {
+        return byte === 0x20 || (byte >= 0x09 && byte <= 0x0d);
+    }
+
+    /**
+     * 将数值格式化为文本，浮点值与NumPy/Python的repr写法一致
+     * 浮点数据中的整数值保留一位小数（包括-0.0），整数写法的数据保持原样
+     * @param value 数值
+     * @param integerText 该值所在行是否为整数写法
+     * @returns 格式化后的字符串
+     */
+    private static formatValue(value: number, integerText = false): string {
+        if (!Number.isFinite(value)) {
+            return Number.isNaN(value) ? 'nan' : (value > 0 ? 'inf' : '-inf');
+        }
+        if (Object.is(value, -0)) {
+            return integerText ? '-0' : '-0.0';
+        }
+        if (integerText) {
+            return String(value);
+        }
+        
+        // Python在十进制指数小于-4或不小于16时使用科学计数法
+        const magnitude = Math.abs(value);
+        if (magnitude !== 0 && (magnitude < 1e-4 || magnitude >= 1e16)) {
+            return this.formatExponential(value);
+        }
+        return Number.isInteger(value) ? value.toFixed(1) : String(value);
+    }
+
+    /**
+     * 按Python的写法输出科学计数法，指数至少两位并带符号，如1e-05、1.5e+16
+     * @param value 有限非零数值
+     * @returns 格式化后的字符串
+     */
+    private static formatExponential(value: number): string {
+        // 不指定位数时toExponential给出可还原原值的最短尾数
+        const text = value.toExponential();
+        const split = text.indexOf('e');
+        const exponent = Number(text.slice(split + 1));
+        const exponentDigits = String(Math.abs(exponent)).padStart(2, '0');
+        return `${text.slice(0, split)}e${exponent < 0 ? '-' : '+'}${exponentDigits}`;
+    }
+
+    /**
+     * 格式化一行数值中的第一个值，用于能量等全局属性
+     * @param values 一行解析后的数值
+     * @returns 格式化后的字符串
+     */
+    private static formatFirstValue(values: Float64Array): string {
+        return this.formatValue(values[0], INTEGER_TEXT_LINES.has(values));
+    }
+
+    /**
+     * 将一行数值格式化为空格分隔的文本
+     * @param values 一行解析后的数值
+     * @returns 格式化后的字符串
+     */
+    private static formatValues(values: Float64Array): string {
+        const integerText = INTEGER_TEXT_LINES.has(values);
+        let result = '';
+        for (let k = 0; k < values.length; k++) {
+            result += (k > 0 ? ' ' : '') + this.formatValue(values[k], integerText);
+        }
+        return result;
+    }
+
     /**
      * 获取目录中的所有属性文件
      * @param txtDir 包含文本文件的目录
@@ -42,29 +225,39 @@ export class XyzGenerator {
             const essentialProps = ['real_atom_types', 'coord', 'energy', 'force', 'box'];
             const result: {[key: string]: string} = {};
             
-            // 如果目录不存在，返回空结果
-            if (!fs.existsSync(txtDir)) {
-                return result;
+            // 一次读取目录项及其类型，无需额外的stat调用
+            let entries: fs.Dirent[];
+            try {
+                entries = await fs.promises.readdir(txtDir, { withFileTypes: true });
+            } catch (error) {
+                // 如果目录不存在，返回空结果
+                if ((error as NodeJS.ErrnoException).code === 'ENOENT') {
+                    return result;
+                }
+                throw error;
             }
             
-            const files = await fs.promises.readdir(txtDir);
+            // 收集目录中的txt文件，跳过子目录
+            const txtFiles = new Map<string, string>();
+            for (const entry of entries) {
+                if (entry.isFile() && entry.name.endsWith('.txt')) {
+                    txtFiles.set(path.basename(entry.name, '.txt'), path.join(txtDir, entry.name));
+                }
+            }
             
             // 首先查找基本属性
             for (const propName of essentialProps) {
-                const fileName = `${propName}.txt`;
-                if (files.includes(fileName)) {
-                    result[propName] = path.join(txtDir, fileName);
+                const filePath = txtFiles.get(propName);
+                if (filePath) {
+                    result[propName] = filePath;
                 }
             }
             
             // 然后添加其它属性文件
-            for (const file of files) {
-                if (file.endsWith('.txt')) {
-                    const propName = file.replace('.txt', '');
-                    // 跳过已添加的
-                    if (!result[propName]) {
-                        result[propName] = path.join(txtDir, file);
-                    }
+            for (const [propName, filePath] of txtFiles) {
+                // 跳过已添加的
+                if (!result[propName]) {
+                    result[propName] = filePath;
                 }
             }
             
@@ -81,7 +274,7 @@ export class XyzGenerator {
      * @param numAtoms 原子数量
      * @returns 每个原子的组件数量，或0表示全局属性
      */
-    private static getPropertyComponents(data: string[][], numAtoms: number): number {
+    private static getPropertyComponents(data: Float64Array[], numAtoms: number): number {
         // 确保有数据
         if (!data || data.length === 0 || data[0].length === 0) {
             return 0;
@@ -118,8 +311,7 @@ export class XyzGenerator {
         // 如果无法确定，尝试一些启发式方法
         
         // 1. 检查数据中的值范围，物理属性通常有特定范围
-        const sampleValues = data[0].slice(0, Math.min(30, data[0].length))
-            .map(v => parseFloat(v))
+        const sampleValues = Array.from(data[0].subarray(0, Math.min(30, data[0].length)))
             .filter(v => !isNaN(v));
         
         if (sampleValues.length > 0) {
@@ -157,9 +349,9 @@ export class XyzGenerator {
      */
     public static validateDataConsistency(
         atomTypes: string[][], 
-        coordinates: string[][], 
-        energies: string[][],
-        additionalProperties: {[key: string]: string[][]} = {}
+        coordinates: Float64Array[], 
+        energies: Float64Array[],
+        additionalProperties: {[key: string]: Float64Array[]} = {}
     ): boolean {
         const numFrames = atomTypes.length;
         const warnings: string[] = [];
@@ -206,38 +398,40 @@ export class XyzGenerator {
         }
         
         // 第二遍：检查数据一致性
-        for (let i = 0; i < numFrames; i++) {
-            if (i >= coordinates.length || i >= atomTypes.length) continue;
-
-            const numAtoms = atomTypes[i].length;
-            const expectedCoordLength = numAtoms * 3;
-            
-            // 检查坐标数据长度
+        // 预先计算每帧的原子数，后续检查只比较长度
+        const numCheckedFrames = Math.min(numFrames, coordinates.length);
+        const atomCounts = new Int32Array(numCheckedFrames);
+        for (let i = 0; i < numCheckedFrames; i++) {
+            atomCounts[i] = atomTypes[i].length;
+        }
+        
+        // 检查坐标数据长度
+        for (let i = 0; i < numCheckedFrames; i++) {
+            const expectedCoordLength = atomCounts[i] * 3;
             if (coordinates[i].length !== expectedCoordLength) {
                 errors.push(`Frame ${i}: expected ${expectedCoordLength} coordinates, but got ${coordinates[i].length}`);
             }
+        }
+        
+        // 检查每个额外属性，只验证原子属性（组件数>0）
+        for (const [propName, propData] of Object.entries(additionalProperties)) {
+            const components = propertyComponents[propName] || 0;
+            if (!propData || components === 0) continue;
             
-            // 检查每个额外属性
-            for (const [propName, propData] of Object.entries(additionalProperties)) {
-                if (!propData || i >= propData.length) continue;
-                
-                const components = propertyComponents[propName] || 0;
+            const numPropFrames = Math.min(numCheckedFrames, propData.length);
+            for (let i = 0; i < numPropFrames; i++) {
+                const expectedLength = atomCounts[i] * components;
+                const actualLength = propData[i].length;
                 
-                // 只验证原子属性（组件数>0）
-                if (components > 0) {
-                    const expectedLength = numAtoms * components;
-                    const actualLength = propData[i].length;
+                // 如果不匹配但很接近，生成警告而非错误
+                if (actualLength !== expectedLength) {
+                    // 计算误差百分比
+                    const errorPercent = Math.abs(actualLength - expectedLength) / expectedLength * 100;
                     
-                    // 如果不匹配但很接近，生成警告而非错误
-                    if (actualLength !== expectedLength) {
-                        // 计算误差百分比
-                        const errorPercent = Math.abs(actualLength - expectedLength) / expectedLength * 100;
-                        
-                        if (errorPercent < 10) { // 10%以内的误差可以接受
-                            warnings.push(`Frame ${i}: ${propName} 长度为 ${actualLength}，与预期的 ${expectedLength} 相差 ${errorPercent.toFixed(1)}%`);
-                        } else {
-                            errors.push(`Frame ${i}: expected ${expectedLength} ${propName} values, but got ${actualLength}`);
-                        }
+                    if (errorPercent < 10) { // 10%以内的误差可以接受
+                        warnings.push(`Frame ${i}: ${propName} 长度为 ${actualLength}，与预期的 ${expectedLength} 相差 ${errorPercent.toFixed(1)}%`);
+                    } else {
+                        errors.push(`Frame ${i}: expected ${expectedLength} ${propName} values, but got ${actualLength}`);
                     }
                 }
             }
@@ -257,19 +451,44 @@ export class XyzGenerator {
     }
 
     /**
-     * 生成XYZ文件内容
+     * 将一帧的原子数据格式化为文本块，每个原子一行
+     * @param atoms 该帧的原子类型
+     * @param columns 每原子数据列，包含数据和每原子分量数
+     * @returns 该帧所有原子行组成的文本，以换行结尾
+     */
+    private static formatAtomBlock(
+        atoms: string[],
+        columns: {data: Float64Array, components: number}[]
+    ): string {
+        let block = '';
+        for (let j = 0; j < atoms.length; j++) {
+            let line = atoms[j];
+            for (const column of columns) {
+                const start = j * column.components;
+                const integerText = INTEGER_TEXT_LINES.has(column.data);
+                for (let k = start; k < start + column.components; k++) {
+                    line += ' ' + this.formatValue(column.data[k], integerText);
+                }
+            }
+            block += line + '\n';
+        }
+        return block;
+    }
+
+    /**
+     * 生成XYZ文件内容并逐帧写入输出文件
+     * @param out 输出文件写入器
      * @param atomTypes 原子类型数据
      * @param coordinates 坐标数据
      * @param energies 能量数据
-     * @returns XYZ文件内容
      */
-    public static generateXyzContent(
+    public static async generateXyzContent(
+        out: BufferedWriter,
         atomTypes: string[][], 
-        coordinates: string[][], 
-        energies: string[][]
-    ): string {
+        coordinates: Float64Array[], 
+        energies: Float64Array[]
+    ): Promise<void> {
         const numFrames = atomTypes.length;
-        const content: string[] = [];
 
         for (let i = 0; i < numFrames; i++) {
             const numAtoms = atomTypes[i].length;
@@ -278,9 +497,6 @@ export class XyzGenerator {
                 throw new Error(`Frame ${i}: Missing energy data`);
             }
 
-            content.push(`     ${numAtoms}`);
-            content.push(` i = ${i}, E = ${energies[i][0]}`);
-
             if (i >= coordinates.length) {
                 throw new Error(`Frame ${i}: Missing coordinate data`);
             }
@@ -289,45 +505,30 @@ export class XyzGenerator {
                 throw new Error(`Frame ${i}: expected ${numAtoms * 3} coordinates, but got ${coordinates[i].length}`);
             }
 
-            for (let j = 0; j < numAtoms; j++) {
-                if (j >= atomTypes[i].length) {
-                    throw new Error(`Frame ${i}, Atom ${j}: Missing atom type data`);
-                }
-                
-                const atom = atomTypes[i][j];
-                const coordStart = j * 3;
-                const coordEnd = (j + 1) * 3;
-                
-                if (coordEnd > coordinates[i].length) {
-                    throw new Error(`Frame ${i}, Atom ${j}: Incomplete coordinate data`);
-                }
-                
-                const coords = coordinates[i].slice(coordStart, coordEnd);
-                content.push(`${atom} ${coords.join(' ')}`);
-            }
+            const header = `     ${numAtoms}\n i = ${i}, E = ${this.formatFirstValue(energies[i])}\n`;
+            await out.write(header);
+            await out.write(this.formatAtomBlock(atomTypes[i], [{ data: coordinates[i], components: 3 }]));
         }
-
-        return content.join('\n');
     }
 
     /**
-     * 生成ExtXYZ文件内容，支持各种属性类型
+     * 生成ExtXYZ文件内容并逐帧写入输出文件，支持各种属性类型
+     * @param out 输出文件写入器
      * @param atomTypes 原子类型数据
      * @param coordinates 坐标数据
      * @param energies 能量数据
      * @param additionalProperties 额外属性数据
      * @param pbcOption 周期性边界条件选项
-     * @returns ExtXYZ文件内容
      */
-    public static generateExtXyzContent(
+    public static async generateExtXyzContent(
+        out: BufferedWriter,
         atomTypes: string[][], 
-        coordinates: string[][], 
-        energies: string[][],
-        additionalProperties: {[key: string]: string[][]} = {},
+        coordinates: Float64Array[], 
+        energies: Float64Array[],
+        additionalProperties: {[key: string]: Float64Array[]} = {},
         pbcOption: 'box' | 'fff' = 'fff'
-    ): string {
+    ): Promise<void> {
         const numFrames = atomTypes.length;
-        const content: string[] = [];
 
         // 确定每个额外属性的性质（原子属性或全局属性）
         const propertyTypes: {[key: string]: {isPerAtom: boolean, components: number}} = {};
@@ -354,6 +555,22 @@ export class XyzGenerator {
             }
         }
 
+        // 预先拆分原子属性和全局属性，避免每帧重复遍历
+        const perAtomProps: {name: string, components: number}[] = [];
+        const globalProps: string[] = [];
+        for (const [propName, propInfo] of Object.entries(propertyTypes)) {
+            if (propInfo.isPerAtom) {
+                perAtomProps.push({ name: propName, components: propInfo.components });
+            } else {
+                globalProps.push(propName);
+            }
+        }
+        
+        // Properties定义在所有帧都有全部原子属性时保持不变，只构建一次
+        const buildPropertiesDef = (props: {name: string, components: number}[]) =>
+            'Properties=species:S:1:pos:R:3' + props.map(p => `:${p.name}:R:${p.components}`).join('');
+        const fullPropertiesDef = buildPropertiesDef(perAtomProps);
+
         // 生成每一帧的内容
         for (let i = 0; i < numFrames; i++) {
             const numAtoms = atomTypes[i].length;
@@ -362,30 +579,25 @@ export class XyzGenerator {
                 throw new Error(`Frame ${i}: Missing energy data`);
             }
 
-            // 第一行：原子数量
-            content.push(`${numAtoms}`);
+            // 该帧有数据的原子属性
+            const frameProps = perAtomProps.filter(p => i < additionalProperties[p.name].length);
 
             // 第二行：属性定义和全局值
             // 格式: Properties=species:S:1:pos:R:3:其他属性... 全局属性=值
-            let propertiesLine = 'Properties=species:S:1:pos:R:3';
-            
-            // 添加原子属性到Properties定义
-            for (const [propName, propInfo] of Object.entries(propertyTypes)) {
-                if (propInfo.isPerAtom && additionalProperties[propName] && i < additionalProperties[propName].length) {
-                    propertiesLine += `:${propName}:R:${propInfo.components}`;
-                }
-            }
+            let propertiesLine = frameProps.length === perAtomProps.length
+                ? fullPropertiesDef
+                : buildPropertiesDef(frameProps);
             
             // 添加能量作为全局属性
-            propertiesLine += ` energy=${energies[i][0]}`;
+            propertiesLine += ` energy=${this.formatFirstValue(energies[i])}`;
             
             // 添加其他全局属性
-            for (const [propName, propInfo] of Object.entries(propertyTypes)) {
-                if (!propInfo.isPerAtom && additionalProperties[propName] && i < additionalProperties[propName].length) {
+            for (const propName of globalProps) {
+                if (i < additionalProperties[propName].length) {
                     // 使用属性的第一个值作为全局值
-                    const value = additionalProperties[propName][i][0];
-                    if (value !== undefined) {
-                        propertiesLine += ` ${propName}=${value}`;
+                    const frameValues = additionalProperties[propName][i];
+                    if (frameValues.length > 0) {
+                        propertiesLine += ` ${propName}=${this.formatFirstValue(frameValues)}`;
                     }
                 }
             }
@@ -397,67 +609,36 @@ export class XyzGenerator {
                 // 确保box数据长度正确
                 const boxData = additionalProperties['box'][i];
                 if (boxData.length >= 9) {
-                    pbcValue = boxData.join(' ');
+                    pbcValue = this.formatValues(boxData);
                 }
             }
             propertiesLine += ` pbc="${pbcValue}"`;
             
             // 添加帧索引作为全局属性
             propertiesLine += ` frame=${i}`;
-            
-            content.push(propertiesLine);
 
             // 检查坐标数据长度
             if (i >= coordinates.length || coordinates[i].length !== numAtoms * 3) {
                 throw new Error(`Frame ${i}: Invalid coordinate data`);
             }
 
-            // 写入每个原子的数据
-            for (let j = 0; j < numAtoms; j++) {
-                if (j >= atomTypes[i].length) {
-                    throw new Error(`Frame ${i}, Atom ${j}: Missing atom type data`);
-                }
-                
-                const atom = atomTypes[i][j];
-                const coordStart = j * 3;
-                const coordEnd = (j + 1) * 3;
-                
-                if (coordEnd > coordinates[i].length) {
-                    throw new Error(`Frame ${i}, Atom ${j}: Incomplete coordinate data`);
-                }
+            // 收集坐标和每个原子的属性列
+            const columns = [{ data: coordinates[i], components: 3 }];
+            for (const prop of frameProps) {
+                const propData = additionalProperties[prop.name][i];
                 
-                // 添加原子类型和坐标
-                const coords = coordinates[i].slice(coordStart, coordEnd);
-                let line = `${atom} ${coords.join(' ')}`;
-                
-                // 添加每个原子的属性值
-                for (const [propName, propInfo] of Object.entries(propertyTypes)) {
-                    if (propInfo.isPerAtom && additionalProperties[propName] && i < additionalProperties[propName].length) {
-                        try {
-                            const propData = additionalProperties[propName][i];
-                            const components = propInfo.components;
-                            const valueStart = j * components;
-                            const valueEnd = valueStart + components;
-                            
-                            // 确保数据边界正确
-                            if (valueEnd <= propData.length) {
-                                const values = propData.slice(valueStart, valueEnd);
-                                line += ` ${values.join(' ')}`;
-                            } else {
-                                // 数据不足时发出警告但继续处理
-                                console.warn(`Frame ${i}, Atom ${j}: ${propName}数据不足，跳过`);
-                            }
-                        } catch (error) {
-                            console.warn(`处理属性 ${propName} 时出错: ${error}`);
-                        }
-                    }
+                // 确保数据边界正确，数据不足时发出警告但继续处理
+                if (propData.length >= numAtoms * prop.components) {
+                    columns.push({ data: propData, components: prop.components });
+                } else {
+                    console.warn(`Frame ${i}: ${prop.name}数据不足，跳过`);
                 }
-                
-                content.push(line);
             }
-        }
 
-        return content.join('\n');
+            // 第一行为原子数量，随后是属性行和每个原子的数据
+            await out.write(`${numAtoms}\n${propertiesLine}\n`);
+            await out.write(this.formatAtomBlock(atomTypes[i], columns));
+        }
     }
 
     /**
@@ -477,23 +658,25 @@ export class XyzGenerator {
         try {
             // 读取输入文件
             const atomTypes = await this.readFile(atomTypesPath);
-            const coordinates = await this.readFile(coordinatesPath);
-            const energies = await this.readFile(energiesPath);
+            const coordinates = await this.readNumericFile(coordinatesPath);
+            const energies = await this.readNumericFile(energiesPath);
             
             // 验证数据一致性
             this.validateDataConsistency(atomTypes, coordinates, energies);
             
-            // 生成XYZ内容
-            const xyzContent = this.generateXyzContent(atomTypes, coordinates, energies);
-            
             // 确定输出路径
             const finalOutputPath = outputPath || path.join(
                 path.dirname(atomTypesPath), 
                 `output_${Date.now()}.xyz`
             );
             
-            // 写入文件
-            await fs.promises.writeFile(finalOutputPath, xyzContent);
+            // 逐帧生成XYZ内容并写入文件
+            const out = await BufferedWriter.open(finalOutputPath);
+            try {
+                await this.generateXyzContent(out, atomTypes, coordinates, energies);
+            } finally {
+                await out.close();
+            }
             
             return finalOutputPath;
         } catch (error) {
@@ -501,6 +684,58 @@ export class XyzGenerator {
         }
     }
 
+    /**
+     * 按输出格式生成XYZ或ExtXYZ文件
+     * @param outputFormat 输出格式：'xyz'、'extxyz'（基本属性）或 'extxyz-full'（所有属性）
+     * @param atomTypesPath 原子类型文件路径
+     * @param coordinatesPath 坐标文件路径
+     * @param energiesPath 能量文件路径
+     * @param forcesPath 力文件路径
+     * @param boxPath 周期性边界盒文件路径
+     * @param pbcOption 周期性边界条件选项
+     * @param outputPath 输出文件路径
+     * @returns 生成的文件路径
+     */
+    public static async generateByFormat(
+        outputFormat: 'xyz' | 'extxyz' | 'extxyz-full',
+        atomTypesPath: string, 
+        coordinatesPath: string, 
+        energiesPath: string, 
+        forcesPath?: string, 
+        boxPath?: string,
+        pbcOption: 'box' | 'fff' = 'fff',
+        outputPath?: string
+    ): Promise<string> {
+        if (outputFormat === 'xyz') {
+            return this.generateXyz(atomTypesPath, coordinatesPath, energiesPath, outputPath);
+        }
+        
+        if (outputFormat === 'extxyz' || outputFormat === 'extxyz-full') {
+            // 完整ExtXYZ包含所有发现的属性，标准ExtXYZ只包含基本属性
+            return this.generateExtXyz(
+                atomTypesPath,
+                coordinatesPath,
+                energiesPath,
+                forcesPath,
+                boxPath,
+                pbcOption,
+                outputPath,
+                outputFormat === 'extxyz-full'
+            );
+        }
+        
+        throw new Error(`Unsupported output format: ${outputFormat}`);
+    }
+
+    /**
+     * 获取输出格式对应的文件扩展名
+     * @param outputFormat 输出格式
+     * @returns 文件扩展名（不含点）
+     */
+    public static getOutputExtension(outputFormat: 'xyz' | 'extxyz' | 'extxyz-full'): string {
+        return outputFormat === 'extxyz-full' ? 'extxyz' : outputFormat;
+    }
+
     /**
      * 生成ExtXYZ文件，支持所有可用属性
      * @param atomTypesPath 原子类型文件路径
@@ -526,20 +761,20 @@ export class XyzGenerator {
         try {
             // 读取输入文件
             const atomTypes = await this.readFile(atomTypesPath);
-            const coordinates = await this.readFile(coordinatesPath);
-            const energies = await this.readFile(energiesPath);
+            const coordinates = await this.readNumericFile(coordinatesPath);
+            const energies = await this.readNumericFile(energiesPath);
             
             // 额外属性
-            const additionalProperties: {[key: string]: string[][]} = {};
+            const additionalProperties: {[key: string]: Float64Array[]} = {};
             
             // 添加力数据（如果提供）
             if (forcesPath && fs.existsSync(forcesPath)) {
-                additionalProperties['force'] = await this.readFile(forcesPath);
+                additionalProperties['force'] = await this.readNumericFile(forcesPath);
             }
             
             // 添加周期性边界盒数据（如果提供）
             if (boxPath && fs.existsSync(boxPath)) {
-                additionalProperties['box'] = await this.readFile(boxPath);
+                additionalProperties['box'] = await this.readNumericFile(boxPath);
             }
             
             // 如果includeAllProperties为true，查找并包含所有属性文件
@@ -563,7 +798,7 @@ export class XyzGenerator {
                     
                     // 加载属性数据
                     try {
-                        additionalProperties[propName] = await this.readFile(filePath);
+                        additionalProperties[propName] = await this.readNumericFile(filePath);
                         console.log(`加载额外属性: ${propName} 从 ${filePath}`);
                     } catch (error) {
                         console.warn(`加载属性文件 ${filePath} 失败: ${error}`);
@@ -574,19 +809,21 @@ export class XyzGenerator {
             // 验证数据一致性
             this.validateDataConsistency(atomTypes, coordinates, energies, additionalProperties);
             
-            // 生成ExtXYZ内容
-            const extxyzContent = this.generateExtXyzContent(
-                atomTypes, coordinates, energies, additionalProperties, pbcOption
-            );
-            
             // 确定输出路径
             const finalOutputPath = outputPath || path.join(
                 path.dirname(atomTypesPath), 
                 `output_${Date.now()}.extxyz`
             );
             
-            // 写入文件
-            await fs.promises.writeFile(finalOutputPath, extxyzContent);
+            // 逐帧生成ExtXYZ内容并写入文件
+            const out = await BufferedWriter.open(finalOutputPath);
+            try {
+                await this.generateExtXyzContent(
+                    out, atomTypes, coordinates, energies, additionalProperties, pbcOption
+                );
+            } finally {
+                await out.close();
+            }
             
             return finalOutputPath;
         } catch (error) {